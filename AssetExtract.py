@@ -1,14 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import gc
 import os
 import sys
 import json
 import argparse
-import importlib
+import importlib.metadata
 import subprocess
 import time
-from datetime import datetime
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.util import find_spec
 from pathlib import Path
 
 # ------------------------------------------------------------
@@ -16,34 +20,125 @@ from pathlib import Path
 # ------------------------------------------------------------
 required_packages = {
     "UnityPy": "UnityPy",
-    "colorama": "colorama",
+    "orjson": "orjson",
 }
 
 def install_if_missing(packages: dict[str, str]) -> None:
     for pip_name, import_name in packages.items():
-        try:
-            importlib.import_module(import_name)
-        except ImportError:
+        # find_spec only locates the package, without executing it
+        if find_spec(import_name) is None:
             print(f"Installing missing package: {pip_name}")
             subprocess.check_call([sys.executable, "-m", "pip", "install", pip_name])
 
-install_if_missing(required_packages)
+def _is_installed(dist_name: str) -> bool:
+    try:
+        importlib.metadata.version(dist_name)
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return True
+
+def install_pillow_simd() -> None:
+    """Swap stock Pillow for Pillow-SIMD: same API, SIMD pixel routines (CPU needs SSE4.1)"""
+    # Both share the PIL package directory; if stock Pillow is installed too it has
+    # overwritten (some of) the SIMD build's files, so the swap isn't done
+    if _is_installed("Pillow-SIMD") and not _is_installed("Pillow"):
+        return
+    print("Replacing Pillow with Pillow-SIMD")
+    subprocess.check_call([sys.executable, "-m", "pip", "uninstall", "-y", "Pillow", "Pillow-SIMD"])
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pillow-simd"])
+    except subprocess.CalledProcessError:
+        # Pillow-SIMD builds from source; put stock Pillow back if that fails
+        print("Pillow-SIMD install failed, reinstalling Pillow")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow"])
+
+# colorama is needed for logging from the start; it's light enough to import up front
+install_if_missing({"colorama": "colorama"})
 
-import UnityPy
 from colorama import init, Fore, Style
 
 init(autoreset=True)
 
+# Heavy imports are deferred to _boot() so --help and argument errors don't pay for them
+UnityPy = None
+orjson = None
+
+def _import_packages() -> None:
+    global UnityPy, orjson
+    import UnityPy as _unitypy
+    UnityPy = _unitypy
+    try:
+        import orjson as _orjson
+    except ImportError:
+        _orjson = None
+    orjson = _orjson
+
+def _boot(pillow_simd: bool) -> None:
+    install_if_missing(required_packages)
+    # After installing UnityPy, whose Pillow requirement pulls stock Pillow back
+    # in, and before importing it so this run already uses the SIMD build
+    if pillow_simd:
+        install_pillow_simd()
+    _import_packages()
+
 
 # ------------------------------------------------------------
 # Logging helper
 # ------------------------------------------------------------
-def log(msg: str, colour: str = Fore.CYAN, debug_only: bool = False) -> None:
-    if debug_only and not DEBUG:
-        return
-    timestamp = datetime.now().strftime("%H:%M:%S")
+# Set from argv in the entry point and handed to worker processes explicitly,
+# since spawned workers re-import this module without running __main__
+DEBUG = False
+
+# Debug output is buffered and printed in batches rather than one print per line
+DEBUG_FLUSH_EVERY = 64
+
+_debug_lines: list[str] = []
+_debug_lock = threading.Lock()
+
+# (epoch second, formatted "%H:%M:%S") of the last timestamp handed out;
+# swapped as one tuple so encode threads never see a half-updated pair
+_last_ts: tuple[int, str] = (0, "")
+
+def _timestamp() -> str:
+    global _last_ts
+    now = int(time.time())
+    cached = _last_ts
+    if cached[0] != now:
+        cached = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+        _last_ts = cached
+    return cached[1]
+
+def flush_debug() -> None:
+    with _debug_lock:
+        if _debug_lines:
+            print("\n".join(_debug_lines))
+            _debug_lines.clear()
+
+def log(msg: str, colour: str = Fore.CYAN) -> None:
+    if _debug_lines:
+        flush_debug()  # keep buffered debug lines ahead of this one
+    timestamp = _timestamp()
     print(f"{colour}[{timestamp}] {msg}{Style.RESET_ALL}")
 
+def _debug_log_buffered(msg: str, colour: str = Fore.CYAN) -> None:
+    timestamp = _timestamp()
+    with _debug_lock:
+        _debug_lines.append(f"{colour}[{timestamp}] {msg}{Style.RESET_ALL}")
+        full = len(_debug_lines) >= DEBUG_FLUSH_EVERY
+    if full:
+        flush_debug()
+
+def _debug_log_disabled(msg: str, colour: str = Fore.CYAN) -> None:
+    pass
+
+# Verbose per-file logging; rebound by set_debug so non-debug runs pay only a no-op call
+debug_log = _debug_log_disabled
+
+def set_debug(enabled: bool) -> None:
+    global DEBUG, debug_log
+    DEBUG = enabled
+    debug_log = _debug_log_buffered if enabled else _debug_log_disabled
+
 
 # ------------------------------------------------------------
 # Argument parsing
@@ -53,172 +148,405 @@ parser.add_argument("-file", nargs=2, metavar=('INPUT_DIR', 'OUTPUT_DIR'),
                     help="Custom input and output directories")
 parser.add_argument("--debug", action="store_true",
                     help="Enable verbose per-file logging")
-args = parser.parse_args()
+parser.add_argument("--pretty-json", action="store_true",
+                    help="Indent MonoBehaviour JSON output (slower; compact by default)")
+parser.add_argument("--png-compress-level", type=int, default=1, choices=range(10), metavar="0-9",
+                    help="zlib level for PNG output (default: 1, fast encode with larger files)")
+parser.add_argument("--pillow-simd", action="store_true",
+                    help="Replace Pillow with Pillow-SIMD before running (needs an SSE4.1 CPU and a C compiler)")
+
+# Set from argv in the entry point and handed to worker processes like DEBUG
+PRETTY_JSON = False
+PNG_COMPRESS_LEVEL = 1
 
-DEBUG = args.debug
 
 # ------------------------------------------------------------
-# Paths
+# Background PNG encoding
 # ------------------------------------------------------------
-source_in = Path.cwd()
-dest_out = Path.cwd()
-
-if args.file:
-    source_in = Path(args.file[0]).resolve()
-    dest_out = Path(args.file[1]).resolve()
-    log("> Using custom paths:", Fore.CYAN)
-else:
-    log("> Using current directory:", Fore.CYAN)
+# Pillow releases the GIL while compressing, so PNG encodes run on a thread
+# pool while the caller moves on to decoding the next texture. There is already
+# one worker process per core, so each only needs a couple of encode threads.
+ENCODE_THREADS = 2
+# Every pending save holds a fully decoded image; keep just enough queued to
+# keep the encode threads busy
+MAX_PENDING_SAVES = 2 * ENCODE_THREADS
+
+_io_pool = ThreadPoolExecutor(max_workers=ENCODE_THREADS)
+_pending_saves: deque[tuple[str, Future]] = deque()
+# Latest in-flight save per output path; different assets can share an
+# upper-cased basename, and two saves to one file must never overlap
+_pending_by_path: dict[str, Future] = {}
+
+def _replace_into(out_path: str, write) -> None:
+    """Write via a private temp file beside out_path, then os.replace it into place"""
+    # Workers can produce the same output name at once; this way bytes from two
+    # writers never mix and the file is always one writer's complete output
+    tmp_path = f"{out_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _write_bytes(out_path: str, raw: bytes) -> None:
+    def write(path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(raw)
+    _replace_into(out_path, write)
+
+def _write_png(image, out_path: str, type_name: str, asset_path: str) -> None:
+    def write(path: str) -> None:
+        image.save(path, format="PNG", compress_level=PNG_COMPRESS_LEVEL, optimize=False)
+    try:
+        _replace_into(out_path, write)
+        debug_log(f"> Writing {type_name} to: {Fore.WHITE}{out_path}{Style.RESET_ALL}", Fore.GREEN)
+    except Exception as e:
+        debug_log(f"> Error writing {type_name} {asset_path}: {e}", Fore.RED)
 
-log(f"> InputSet : {Fore.WHITE}{source_in}{Style.RESET_ALL}", Fore.CYAN)
-log(f"> OutputSet: {Fore.WHITE}{dest_out}{Style.RESET_ALL}", Fore.CYAN)
+def flush_saves(limit: int = 0) -> None:
+    """Wait until at most `limit` PNG encodes are still in flight"""
+    while len(_pending_saves) > limit:
+        out_path, fut = _pending_saves.popleft()
+        fut.result()
+        if _pending_by_path.get(out_path) is fut:
+            del _pending_by_path[out_path]
 
 
 # ------------------------------------------------------------
 # Core extraction helpers
 # ------------------------------------------------------------
-def save_image(obj, asset_path: str, folder: str, out_root: Path):
+# Output folders already created by this process
+_dirs_made: set[str] = set()
+
+def _ensure_dir(path: str) -> None:
+    if path not in _dirs_made:
+        os.makedirs(path, exist_ok=True)
+        _dirs_made.add(path)
+
+def _output_path(out_root: str, folder: str, asset_path: str, ext: str) -> str:
+    filename = os.path.basename(asset_path).upper()
+    return os.path.join(out_root, folder, os.path.splitext(filename)[0] + ext)
+
+def read_image(obj):
+    return obj.read().image
+
+def save_image(image, out_path: str, type_name: str, asset_path: str):
+    # Let an earlier save to the same file finish first, so the last asset still wins
+    prev = _pending_by_path.get(out_path)
+    if prev is not None:
+        prev.result()
+    fut = _io_pool.submit(_write_png, image, out_path, type_name, asset_path)
+    _pending_by_path[out_path] = fut
+    _pending_saves.append((out_path, fut))
+    flush_saves(MAX_PENDING_SAVES)
+
+def read_textasset(obj) -> bytes:
+    # Encode once and write bytes; raw bytes from older UnityPy go straight out
+    script = obj.read().m_Script
+    if isinstance(script, (bytes, bytearray)):
+        return script
+    script = str(script)
     try:
-        data = obj.read()
-        filename = Path(asset_path).name.upper()
-        out_path = out_root / folder / filename
-        out_path = out_path.with_suffix(".png")
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        data.image.save(str(out_path))
-        log(f"> Writing {obj.type.name} to: {Fore.WHITE}{out_path}{Style.RESET_ALL}", Fore.GREEN, debug_only=True)
-    except Exception as e:
-        log(f"> Error writing {obj.type.name} {asset_path}: {e}", Fore.RED, debug_only=True)
-
-def save_textasset(obj, asset_path: str, out_root: Path):
-    try:
-        data = obj.read()
-        filename = Path(asset_path).name.upper()
-        out_path = out_root / "TextAsset" / filename
-        out_path = out_path.with_suffix(".txt")
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-
-        script = str(data.m_Script)
-        try:
-            out_path.write_text(script, encoding='utf-8', errors='surrogatepass')
-        except UnicodeEncodeError:
-            log(f"> Unicode error, retrying with replace", Fore.RED, debug_only=True)
-            out_path.write_text(script, encoding='utf-8', errors='replace')
-        log(f"> Writing TextAsset to: {Fore.WHITE}{out_path}{Style.RESET_ALL}", Fore.GREEN, debug_only=True)
-    except Exception as e:
-        log(f"> Error writing TextAsset {asset_path}: {e}", Fore.RED, debug_only=True)
+        return script.encode('utf-8', errors='surrogatepass')
+    except UnicodeEncodeError:
+        debug_log(f"> Unicode error, retrying with replace", Fore.RED)
+        return script.encode('utf-8', errors='replace')
+
+def save_textasset(raw: bytes, out_path: str, type_name: str, asset_path: str):
+    _write_bytes(out_path, raw)
+    debug_log(f"> Writing TextAsset to: {Fore.WHITE}{out_path}{Style.RESET_ALL}", Fore.GREEN)
+
+def write_json(tree: dict, out_path: str) -> None:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if PRETTY_JSON:
+            option |= orjson.OPT_INDENT_2
+        raw = orjson.dumps(tree, option=option)
+    elif PRETTY_JSON:
+        raw = json.dumps(tree, ensure_ascii=False, indent=4).encode('utf-8')
+    else:
+        raw = json.dumps(tree, ensure_ascii=False).encode('utf-8')
+    _write_bytes(out_path, raw)
+
+# Interned so dict/set lookups on obj.type.name usually resolve by identity
+_TEX2D = sys.intern("Texture2D")
+_SPRITE = sys.intern("Sprite")
+_TEXT = sys.intern("TextAsset")
+_MONO = sys.intern("MonoBehaviour")
+
+# Container asset types -> (extension, reader, writer); each type is saved under
+# a folder of the same name
+_DISPATCH = {
+    _TEX2D: (".png", read_image, save_image),
+    _SPRITE: (".png", read_image, save_image),
+    _TEXT: (".txt", read_textasset, save_textasset),
+}
+_IMAGE_TYPES = frozenset({_TEX2D, _SPRITE})
+_TEXT_TYPES = frozenset({_TEXT})
 
-def extract_from_env(env, name_hint: str, out_root: Path):
+def extract_from_env(env, name_hint: str, out_root: str):
     """name_hint: lowercase string like 'metadata' or 'resources' from file/folder name"""
     extract_resources = "resources" in name_hint
     extract_metadata = "metadata" in name_hint
+    extract_all = not (extract_resources or extract_metadata)
+
+    allowed: frozenset[str] = frozenset()
+    if extract_resources or extract_all:
+        allowed |= _IMAGE_TYPES
+    if extract_metadata or extract_all:
+        allowed |= _TEXT_TYPES
+    wanted = allowed | {_MONO} if extract_all else allowed
+
+    # env.objects / env.container rebuild their collections on every access,
+    # so each is fetched once here
+    objects = env.objects
+
+    # Type names are cheap to read before any object is; skip bundles holding
+    # nothing this name hint asks for
+    types_present = {obj.type.name for obj in objects}
+    if not types_present & wanted:
+        debug_log(f"> Nothing to extract from {name_hint}", Fore.YELLOW)
+        return
 
-    if extract_resources or not (extract_resources or extract_metadata):
-        for asset_path, obj in env.container.items():
-            if obj.type.name == "Texture2D":
-                save_image(obj, asset_path, "Texture2D", out_root)
-            elif obj.type.name == "Sprite":
-                save_image(obj, asset_path, "Sprite", out_root)
-
-    if extract_metadata or not (extract_resources or extract_metadata):
-        for asset_path, obj in env.container.items():
-            if obj.type.name == "TextAsset":
-                save_textasset(obj, asset_path, out_root)
-
-    if not (extract_resources or extract_metadata):
-        for obj in env.objects:
-            if obj.type.name != "MonoBehaviour":
+    if types_present & allowed:
+        container = env.container
+        listings = [(asset_path, obj, obj.type.name) for asset_path, obj in container.items()]
+        listings = [listing for listing in listings if listing[2] in allowed]
+
+        # The same object is often listed under several container paths (e.g. an
+        # atlas texture behind many sprites). Each listing still gets its own
+        # output file, but the object is decoded once and the result kept only
+        # until its last listing is written. path_id is unique only within one
+        # serialized file of the bundle, so objects are keyed by file too.
+        remaining = Counter((id(obj.assets_file), obj.path_id) for _, obj, _ in listings)
+        decoded: dict[tuple[int, int], object] = {}
+        written: set[tuple[int, int, str]] = set()
+
+        for asset_path, obj, type_name in listings:
+            obj_key = (id(obj.assets_file), obj.path_id)
+            remaining[obj_key] -= 1
+            ext, read, save = _DISPATCH[type_name]
+            out_path = _output_path(out_root, type_name, asset_path, ext)
+
+            if (*obj_key, out_path) in written:
+                debug_log(f"> Skipping duplicate {type_name} {asset_path}", Fore.YELLOW)
+            else:
+                written.add((*obj_key, out_path))
+                try:
+                    if obj_key in decoded:
+                        payload = decoded[obj_key]
+                        if type_name in _IMAGE_TYPES:
+                            # PIL's save() stores per-call state on the image, so an
+                            # image can't be handed to two encode threads at once
+                            payload = payload.copy()
+                    else:
+                        payload = read(obj)
+                        if remaining[obj_key]:
+                            decoded[obj_key] = payload
+                    _ensure_dir(os.path.join(out_root, type_name))
+                    save(payload, out_path, type_name, asset_path)
+                except Exception as e:
+                    debug_log(f"> Error writing {type_name} {asset_path}: {e}", Fore.RED)
+
+            if not remaining[obj_key]:
+                decoded.pop(obj_key, None)
+
+    if extract_all and _MONO in types_present:
+        for obj in objects:
+            if obj.type.name != _MONO:
                 continue
             try:
                 if obj.serialized_type and obj.serialized_type.nodes:
                     tree = obj.read_typetree()
                     name = tree.get('m_Name', f"MONO_{obj.path_id}")
-                    out_path = out_root / "MonoBehaviour" / f"{name}.json"
-                    out_path.parent.mkdir(parents=True, exist_ok=True)
-                    with out_path.open('w', encoding='utf-8') as f:
-                        json.dump(tree, f, ensure_ascii=False, indent=4)
-                    log(f"> Writing MonoBehaviour to: {Fore.WHITE}{out_path}{Style.RESET_ALL}", Fore.GREEN, debug_only=True)
+                    out_dir = os.path.join(out_root, "MonoBehaviour")
+                    out_path = os.path.join(out_dir, f"{name}.json")
+                    _ensure_dir(out_dir)
+                    write_json(tree, out_path)
+                    debug_log(f"> Writing MonoBehaviour to: {Fore.WHITE}{out_path}{Style.RESET_ALL}", Fore.GREEN)
                 else:
-                    log(f"> Skipping MonoBehaviour {obj.path_id}: no typetree", Fore.RED, debug_only=True)
+                    debug_log(f"> Skipping MonoBehaviour {obj.path_id}: no typetree", Fore.RED)
             except Exception as e:
-                log(f"> Error processing MonoBehaviour {obj.path_id}: {e}", Fore.RED, debug_only=True)
+                debug_log(f"> Error processing MonoBehaviour {obj.path_id}: {e}", Fore.RED)
 
 
 # ------------------------------------------------------------
-# Phase 1: Extract ASTC bundles
+# Worker processes
 # ------------------------------------------------------------
-def extract_astc_bundles(src: Path, dst: Path):
-    log("> Phase 1: Extracting ASTC bundle files", Fore.CYAN)
-    count = 0
-    failed = 0
-    start = time.perf_counter()
+# (bundle path, output root, name hint)
+Job = tuple[str, str, str]
+
+# Bundle parsing churns through many small short-lived objects; workers run the
+# cyclic GC far less often than the default gen0 threshold of 700
+WORKER_GC_THRESHOLD = 50_000
+
+def _init_worker(debug: bool, pretty_json: bool, png_compress_level: int) -> None:
+    global PRETTY_JSON, PNG_COMPRESS_LEVEL
+    if UnityPy is None:  # spawned rather than forked from the booted parent
+        _import_packages()
+    # Move everything imported so far into the permanent generation so
+    # collections during extraction don't keep rescanning it
+    gc.freeze()
+    gc.set_threshold(WORKER_GC_THRESHOLD, 20, 20)
+    set_debug(debug)
+    PRETTY_JSON = pretty_json
+    PNG_COMPRESS_LEVEL = png_compress_level
+
+def _process_bundle(job: Job) -> str | None:
+    """Returns an error message if the bundle failed to load or extract"""
+    path_str, dst_str, name_hint = job
+    try:
+        env = UnityPy.load(path_str)
+        extract_from_env(env, name_hint, dst_str)
+    except Exception as e:
+        return str(e)
+    finally:
+        # Every image of this bundle must be on disk before the job reports back
+        flush_saves()
+        flush_debug()
+    return None
+
+def run_jobs(*batches: list[Job]) -> list[list[str | None]]:
+    """Process batches on all cores, each finishing before the next starts; results per batch in job order"""
+    if not any(batches):
+        return [[] for _ in batches]
+    # Default max_workers is os.cpu_count(), capped at 61 on Windows where
+    # asking for more raises ValueError
+    with ProcessPoolExecutor(initializer=_init_worker,
+                             initargs=(DEBUG, PRETTY_JSON, PNG_COMPRESS_LEVEL)) as ex:
+        return [list(ex.map(_process_bundle, jobs, chunksize=4)) for jobs in batches]
 
-    for root, _, files in os.walk(src):
-        for file_name in files:
-            if "ASTC" not in file_name:
-                continue
 
-            count += 1
-            file_path = Path(root) / file_name
-            log(f"> Processing bundle: {Fore.WHITE}{file_name}{Style.RESET_ALL}", Fore.YELLOW, debug_only=True)
+# ------------------------------------------------------------
+# Job collection
+# ------------------------------------------------------------
+def _walk_jobs(top: str, out_root: str, bundles: list[Job] | None, data: list[Job] | None) -> None:
+    """Appends ASTC bundle files and/or __data files inside ASTC folders under top"""
 
+    def scan(directory: str, astc_parent: str | None) -> None:
+        """astc_parent: name of the closest ASTC folder (below top) containing directory"""
+        # Read the listing up front so the directory handle is closed before recursing
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            debug_log(f"> Skipping unreadable directory {directory}: {e}", Fore.RED)
+            return
+
+        subdirs = []
+        for entry in entries:
+            # Like os.walk: an entry that can't be stat'ed counts as a file, and
+            # symlinked directories are never descended into
             try:
-                env = UnityPy.load(str(file_path))
-                extract_from_env(env, file_name.lower(), dst)
-            except Exception as e:
-                failed += 1
-                log(f"> Failed bundle {file_name}: {e}", Fore.RED, debug_only=True)
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                try:
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    is_symlink = False
+                if not is_symlink:
+                    subdirs.append(entry)
+                continue
 
-    elapsed = time.perf_counter() - start
-    log(f"> Phase 1 Complete: {count} bundle(s), {failed} failed ({elapsed:.2f}s)", Fore.BLUE)
-    return count
+            if bundles is not None and "ASTC" in entry.name:
+                debug_log(f"> Found bundle: {Fore.WHITE}{entry.name}{Style.RESET_ALL}", Fore.YELLOW)
+                bundles.append((entry.path, out_root, entry.name.lower()))
+            elif data is not None and astc_parent is not None and entry.name == "__data":
+                debug_log(f"> Found __data: {Fore.WHITE}{os.path.relpath(entry.path, top)}{Style.RESET_ALL}", Fore.YELLOW)
+                # Use closest ASTC folder name for filtering
+                data.append((entry.path, out_root, astc_parent.lower()))
+
+        for sub in subdirs:
+            scan(sub.path, sub.name if "ASTC" in sub.name else astc_parent)
+
+    scan(top, None)
+
+def collect_jobs(src: Path, dst: Path) -> tuple[list[Job], list[Job]]:
+    """Bundle jobs come from src, __data jobs from dst; one walk when they are the same tree"""
+    src_str, dst_str = str(src), str(dst)
+    bundle_jobs: list[Job] = []
+    data_jobs: list[Job] = []
+
+    if src_str == dst_str:
+        _walk_jobs(src_str, dst_str, bundle_jobs, data_jobs)
+    else:
+        _walk_jobs(src_str, dst_str, bundle_jobs, None)
+        _walk_jobs(dst_str, dst_str, None, data_jobs)
+    return bundle_jobs, data_jobs
 
 
 # ------------------------------------------------------------
-# Phase 2: Extract from __data files inside ASTC folders
+# Extraction
 # ------------------------------------------------------------
-def extract_data_files(root_dir: Path):
-    log("> Phase 2: Extracting from __data files (recursive)", Fore.CYAN)
-    count = 0
-    failed = 0
+def extract_all(src: Path, dst: Path) -> tuple[int, int]:
+    log("> Scanning for ASTC bundles and __data files", Fore.CYAN)
     start = time.perf_counter()
 
-    astc_folders = [p for p in root_dir.rglob("*") if p.is_dir() and "ASTC" in p.name]
-    if not astc_folders:
-        log("> No ASTC folders found for __data extraction.", Fore.YELLOW)
-        return 0
+    bundle_jobs, data_jobs = collect_jobs(src, dst)
+    log(f"> Found {len(bundle_jobs)} bundle(s) + {len(data_jobs)} __data file(s) ({time.perf_counter() - start:.2f}s)", Fore.BLUE)
+    if not data_jobs:
+        log("> No __data files found in ASTC folders.", Fore.YELLOW)
+    log("")  # blank line
 
-    for folder in astc_folders:
-        data_files = list(folder.rglob("__data"))
-        for data_file in data_files:
-            count += 1
-            rel = data_file.relative_to(root_dir)
-            log(f"> Found __data: {Fore.WHITE}{rel}{Style.RESET_ALL}", Fore.YELLOW, debug_only=True)
+    log("> Extracting bundles and __data files", Fore.CYAN)
+    start = time.perf_counter()
+    # __data after bundles, so __data output overwrites bundle output as it always has
+    bundle_results, data_results = run_jobs(bundle_jobs, data_jobs)
 
-            try:
-                env = UnityPy.load(str(data_file))
-                # Use closest ASTC folder name for filtering
-                astc_parent = next(p for p in data_file.parents if "ASTC" in p.name)
-                extract_from_env(env, astc_parent.name.lower(), root_dir)
-            except Exception as e:
-                failed += 1
-                log(f"> Failed __data {rel}: {e}", Fore.RED, debug_only=True)
+    bundle_failed = 0
+    for (file_path, _, _), error in zip(bundle_jobs, bundle_results):
+        if error is not None:
+            bundle_failed += 1
+            debug_log(f"> Failed bundle {os.path.basename(file_path)}: {error}", Fore.RED)
+
+    data_failed = 0
+    for (data_file, dst_str, _), error in zip(data_jobs, data_results):
+        if error is not None:
+            data_failed += 1
+            debug_log(f"> Failed __data {os.path.relpath(data_file, dst_str)}: {error}", Fore.RED)
 
     elapsed = time.perf_counter() - start
-    log(f"> Phase 2 Complete: {count} __data file(s), {failed} failed ({elapsed:.2f}s)", Fore.BLUE)
-    return count
+    log(f"> Extraction Complete: {len(bundle_jobs)} bundle(s), {bundle_failed} failed; "
+        f"{len(data_jobs)} __data file(s), {data_failed} failed ({elapsed:.2f}s)", Fore.BLUE)
+    return len(bundle_jobs), len(data_jobs)
 
 
 # ------------------------------------------------------------
 # Entry point
 # ------------------------------------------------------------
 if __name__ == "__main__":
-    total_start = time.perf_counter()
+    args = parser.parse_args()
+    _boot(args.pillow_simd)
+    set_debug(args.debug)
+    PRETTY_JSON = args.pretty_json
+    PNG_COMPRESS_LEVEL = args.png_compress_level
+
+    # --------------------------------------------------------
+    # Paths
+    # --------------------------------------------------------
+    source_in = Path.cwd()
+    dest_out = Path.cwd()
+
+    if args.file:
+        source_in = Path(args.file[0]).resolve()
+        dest_out = Path(args.file[1]).resolve()
+        log("> Using custom paths:", Fore.CYAN)
+    else:
+        log("> Using current directory:", Fore.CYAN)
+
+    log(f"> InputSet : {Fore.WHITE}{source_in}{Style.RESET_ALL}", Fore.CYAN)
+    log(f"> OutputSet: {Fore.WHITE}{dest_out}{Style.RESET_ALL}", Fore.CYAN)
 
-    bundle_count = extract_astc_bundles(source_in, dest_out)
-    log("")  # blank line
+    total_start = time.perf_counter()
 
-    data_count = extract_data_files(dest_out)
+    bundle_count, data_count = extract_all(source_in, dest_out)
 
     total_time = time.perf_counter() - total_start
     summary = f"> All done! {bundle_count} bundle(s) + {data_count} __data file(s) in {total_time:.2f}s"
-    log(summary, Fore.MAGENTA)
\ No newline at end of file
+    log(summary, Fore.MAGENTA)